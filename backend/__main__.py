@@ -0,0 +1,21 @@
+"""Production entrypoint: ``python -m backend`` runs the API under uvicorn."""
+
+import os
+
+import uvicorn
+
+
+def main() -> None:
+    """Run the API with uvloop/httptools and one worker per CPU by default."""
+    uvicorn.run(
+        "backend.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 """Public API exports for backend route modules."""
 
-from backend.api.routes import router
+from backend.api.routes import accepts_ndjson, router
 
-__all__ = ["router"]
+__all__ = ["accepts_ndjson", "router"]
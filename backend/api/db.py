@@ -1,27 +1,54 @@
 """Database connectivity helpers for API request handlers."""
 
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 
 try:
-    import psycopg
+    from psycopg_pool import AsyncConnectionPool, PoolTimeout
 except ImportError:
-    psycopg = None
+    AsyncConnectionPool = None
+    PoolTimeout = None
 
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://hanie@localhost:5432/postgres")
 
 
-def get_connection():
-    """Create and return a PostgreSQL connection for the current request."""
-    if psycopg is None:
+def create_pool():
+    """Create the process-wide PostgreSQL connection pool, or None when unavailable."""
+    if AsyncConnectionPool is None:
+        return None
+
+    # Opened/closed by the application lifespan so import stays side-effect free.
+    return AsyncConnectionPool(
+        DATABASE_URL,
+        min_size=10,
+        max_size=50,
+        timeout=30,
+        kwargs={"options": "-c statement_timeout=5000"},
+        open=False,
+    )
+
+
+@asynccontextmanager
+async def open_connection(request: Request):
+    """Borrow a connection from the application pool for the enclosed block."""
+    pool = request.app.state.pool
+    if pool is None:
         raise HTTPException(
             status_code=500,
-            detail="PostgreSQL driver missing. Install with: pip install 'psycopg[binary]'",
+            detail="PostgreSQL driver missing. Install with: pip install 'psycopg[binary,pool]'",
         )
 
     try:
-        return psycopg.connect(DATABASE_URL)
-    except Exception as exc:
+        async with pool.connection() as conn:
+            yield conn
+    except PoolTimeout as exc:
         raise HTTPException(status_code=500, detail=f"Database connection error: {exc}") from exc
+
+
+async def get_conn(request: Request):
+    """Yield a pooled PostgreSQL connection for the current request."""
+    async with open_connection(request) as conn:
+        yield conn
@@ -1,98 +1,200 @@
 """HTTP route definitions for facilities, sensor readings, and dashboard summary."""
 
+import asyncio
 import hashlib
-import json
+import struct
+import time
+from contextlib import AsyncExitStack
 from datetime import datetime
 
-from fastapi import APIRouter, Request, Response, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
-from backend.api.db import get_connection
+from backend.api.db import get_conn, open_connection
 from backend.api.schemas import (
-    DashboardMetric,
     DashboardSummary,
     Facility,
     FacilityDetails,
     GenerateReadingsRequest,
     GenerateReadingsResponse,
-    SensorReading,
+    SensorReadingPage,
 )
 from backend.api.services import (
+    decode_reading_cursor,
     generate_sensor_readings,
     get_dashboard_summary,
     get_facility_details,
     list_facilities,
     list_sensor_readings,
+    stream_sensor_readings,
+    validate_sensor_reading_filters,
 )
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_SUMMARY_CACHE_TTL_SECONDS = 5.0
+# facility_id -> (etag, summary, expires_at on the monotonic clock)
+_SUMMARY_CACHE: dict[int, tuple[str, DashboardSummary, float]] = {}
+# facility_id -> (refresh lock, number of coroutines holding/awaiting it);
+# entries only live while a refresh for that facility is in flight.
+_SUMMARY_REFRESH_LOCKS: dict[int, tuple[asyncio.Lock, int]] = {}
+
+_ETAG_INT = struct.Struct("<q")
+_ETAG_FLOAT = struct.Struct("<d")
+_ETAG_METRIC = struct.Struct("<dqd")
 
-def _serialize_metric_for_etag(metric: DashboardMetric) -> dict[str, object]:
-    """Serialize a summary metric into a stable shape for ETag hashing."""
-    ordered_aggregation_values = {
-        key: metric.aggregation_values[key]
-        for key in sorted(metric.aggregation_values.keys())
-    }
-    return {
-        "aggregation": metric.aggregation,
-        "aggregation_values": ordered_aggregation_values,
-        "aggregated_value": metric.aggregated_value,
-        "contributing_assets": metric.contributing_assets,
-        "latest_ts": metric.latest_ts.isoformat(),
-        "metric_name": metric.metric_name,
-        "unit": metric.unit,
-    }
+
+def _update_etag_text(digest, value: str | None) -> None:
+    """Feed a length-prefixed (None-aware) string into an ETag digest."""
+    if value is None:
+        digest.update(_ETAG_INT.pack(-1))
+        return
+    encoded = value.encode("utf-8")
+    digest.update(_ETAG_INT.pack(len(encoded)))
+    digest.update(encoded)
 
 
 def _build_dashboard_summary_etag(summary: DashboardSummary) -> str:
     """Build a strong ETag value from summary content."""
-    fingerprint = {
-        "facility_id": summary.facility_id,
-        "metrics": [_serialize_metric_for_etag(metric) for metric in summary.metrics],
-    }
-    payload = json.dumps(fingerprint, sort_keys=True, separators=(",", ":"))
-    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
-    return f"\"{digest}\""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(_ETAG_INT.pack(summary.facility_id))
+    for metric in summary.metrics:
+        _update_etag_text(digest, metric.metric_name)
+        _update_etag_text(digest, metric.unit)
+        _update_etag_text(digest, metric.aggregation)
+        digest.update(
+            _ETAG_METRIC.pack(
+                metric.aggregated_value,
+                metric.contributing_assets,
+                # Raw POSIX float is stable per instant; no string/int conversion needed.
+                metric.latest_ts.timestamp(),
+            )
+        )
+        for key in sorted(metric.aggregation_values):
+            _update_etag_text(digest, key)
+            digest.update(_ETAG_FLOAT.pack(metric.aggregation_values[key]))
+    return f"\"{digest.hexdigest()}\""
 
 
-def _normalize_etag_value(raw_value: str) -> str:
-    """Normalize weak/strong ETag forms into comparable token text."""
+def _normalize_etag_value(raw_value: bytes) -> bytes:
+    """Normalize weak/strong ETag forms into comparable token bytes."""
     value = raw_value.strip()
-    if value.startswith("W/"):
+    if value.startswith(b"W/"):
         value = value[2:].strip()
     return value
 
 
 def _etag_matches(if_none_match: str, current_etag: str) -> bool:
     """Return True when an If-None-Match header contains the current ETag."""
-    normalized_current = _normalize_etag_value(current_etag)
-    candidates = [value.strip() for value in if_none_match.split(",")]
-    for candidate in candidates:
-        if not candidate:
-            continue
-        if candidate == "*":
+    # Header values are latin-1 on the wire; scan tokens in place instead of
+    # splitting into a list and stop at the first match.
+    header = if_none_match.encode("latin-1", errors="replace")
+    normalized_current = _normalize_etag_value(current_etag.encode("latin-1"))
+    length = len(header)
+    start = 0
+    while start <= length:
+        end = header.find(b",", start)
+        if end == -1:
+            end = length
+        candidate = header[start:end].strip()
+        if candidate == b"*" or (
+            candidate and _normalize_etag_value(candidate) == normalized_current
+        ):
             return True
-        if _normalize_etag_value(candidate) == normalized_current:
+        start = end + 1
+    return False
+
+
+def accepts_ndjson(accept: str) -> bool:
+    """Return True when an Accept header explicitly asks for NDJSON with q > 0."""
+    for media_range in accept.split(","):
+        media_type, _, raw_params = media_range.partition(";")
+        if media_type.strip().lower() != NDJSON_MEDIA_TYPE:
+            continue
+        quality = 1.0
+        for param in raw_params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
             return True
     return False
 
 
+def _get_fresh_summary_entry(facility_id: int) -> tuple[str, DashboardSummary] | None:
+    """Return a still-valid cached (etag, summary), dropping the entry if expired."""
+    cached = _SUMMARY_CACHE.get(facility_id)
+    if cached is None:
+        return None
+    if cached[2] <= time.monotonic():
+        del _SUMMARY_CACHE[facility_id]
+        return None
+    return cached[0], cached[1]
+
+
+async def _get_cached_dashboard_summary(
+    request: Request,
+    facility_id: int,
+) -> tuple[str, DashboardSummary]:
+    """Return (etag, summary) for a facility, hitting the database only when stale."""
+    fresh = _get_fresh_summary_entry(facility_id)
+    if fresh is not None:
+        return fresh
+
+    # One refresh per facility at a time; waiters reuse the fresh entry.
+    lock, users = _SUMMARY_REFRESH_LOCKS.get(facility_id, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    _SUMMARY_REFRESH_LOCKS[facility_id] = (lock, users + 1)
+    try:
+        async with lock:
+            fresh = _get_fresh_summary_entry(facility_id)
+            if fresh is not None:
+                return fresh
+
+            async with open_connection(request) as conn:
+                summary = await get_dashboard_summary(conn, facility_id)
+
+            etag = _build_dashboard_summary_etag(summary)
+            now = time.monotonic()
+            for cached_id in [key for key, entry in _SUMMARY_CACHE.items() if entry[2] <= now]:
+                del _SUMMARY_CACHE[cached_id]
+            _SUMMARY_CACHE[facility_id] = (etag, summary, now + _SUMMARY_CACHE_TTL_SECONDS)
+            return etag, summary
+    finally:
+        lock, users = _SUMMARY_REFRESH_LOCKS[facility_id]
+        if users > 1:
+            _SUMMARY_REFRESH_LOCKS[facility_id] = (lock, users - 1)
+        else:
+            del _SUMMARY_REFRESH_LOCKS[facility_id]
+
+
 @router.get("/facilities", response_model=list[Facility])
-def read_facilities() -> list[Facility]:
+async def read_facilities(conn=Depends(get_conn)) -> list[Facility]:
     """Return all facilities ordered by identifier."""
-    with get_connection() as conn:
-        return list_facilities(conn)
+    return await list_facilities(conn)
 
 
 @router.get("/facilities/{facility_id}", response_model=FacilityDetails)
-def read_facility_details(facility_id: int) -> FacilityDetails:
+async def read_facility_details(facility_id: int, conn=Depends(get_conn)) -> FacilityDetails:
     """Return one facility with its associated assets."""
-    with get_connection() as conn:
-        return get_facility_details(conn, facility_id)
+    return await get_facility_details(conn, facility_id)
 
 
-@router.get("/sensor-readings", response_model=list[SensorReading])
-def read_sensor_readings(
+@router.get(
+    "/sensor-readings",
+    response_model=SensorReadingPage,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def read_sensor_readings(
+    request: Request,
     facility_id: int | None = None,
     asset_id: int | None = None,
     metric_name: str | None = None,
@@ -100,38 +202,81 @@ def read_sensor_readings(
     end: datetime | None = None,
     after_ts: datetime | None = None,
     after_id: int | None = Query(default=None, ge=1),
+    cursor: str | None = None,
     limit: int = Query(default=500, ge=1, le=5000),
-) -> list[SensorReading]:
-    """Return sensor readings filtered by facility/asset/metric/time and optional cursor."""
-    with get_connection() as conn:
-        return list_sensor_readings(
-            conn=conn,
-            facility_id=facility_id,
-            asset_id=asset_id,
-            metric_name=metric_name,
-            start=start,
-            end=end,
-            after_ts=after_ts,
-            after_id=after_id,
-            limit=limit,
+) -> Response:
+    """Return sensor readings filtered by facility/asset/metric/time and optional cursor.
+
+    Clients sending ``Accept: application/x-ndjson`` get one reading per line,
+    streamed straight from a server-side cursor, instead of the JSON page.
+    """
+    if cursor is not None:
+        if after_ts is not None or after_id is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="cursor cannot be combined with after_ts/after_id",
+            )
+        after_ts, after_id = decode_reading_cursor(cursor)
+    # Validated once here for both response formats; streaming cannot report
+    # a 400 after its headers are sent.
+    validate_sensor_reading_filters(start, end, after_ts, after_id)
+
+    filters = {
+        "facility_id": facility_id,
+        "asset_id": asset_id,
+        "metric_name": metric_name,
+        "start": start,
+        "end": end,
+        "after_ts": after_ts,
+        "after_id": after_id,
+        "limit": limit,
+    }
+
+    if accepts_ndjson(request.headers.get("accept", "")):
+        # Borrow the connection before headers go out so pool errors still
+        # surface as a 500; the stream releases it when it finishes.
+        connection_stack = AsyncExitStack()
+        conn = await connection_stack.enter_async_context(open_connection(request))
+
+        async def encode_readings():
+            try:
+                async for reading in stream_sensor_readings(conn, **filters):
+                    yield orjson.dumps(reading) + b"\n"
+            except BaseException as exc:
+                await connection_stack.__aexit__(type(exc), exc, exc.__traceback__)
+                raise
+            finally:
+                await connection_stack.aclose()
+
+        # Left uncompressed by the app's gzip middleware (see backend.main).
+        # The background task covers a stream that is never iterated; closing
+        # an already-released stack is a no-op.
+        return StreamingResponse(
+            encode_readings(),
+            media_type=NDJSON_MEDIA_TYPE,
+            background=BackgroundTask(connection_stack.aclose),
         )
 
+    # Returning a Response skips response_model re-validation; orjson
+    # serializes the row dicts (including datetimes) natively.
+    async with open_connection(request) as conn:
+        page = await list_sensor_readings(conn, **filters)
+    return ORJSONResponse(page)
+
 
 @router.get(
     "/facilities/{facility_id}/dashboard-summary",
     response_model=DashboardSummary,
     responses={304: {"description": "Not Modified"}},
 )
-def read_dashboard_summary(
+async def read_dashboard_summary(
     facility_id: int,
     request: Request,
     response: Response,
 ) -> DashboardSummary | Response:
     """Return dashboard summary with conditional response support via ETag."""
-    with get_connection() as conn:
-        summary = get_dashboard_summary(conn, facility_id)
+    etag, summary = await _get_cached_dashboard_summary(request, facility_id)
 
-    etag = _build_dashboard_summary_etag(summary)
     if_none_match = request.headers.get("if-none-match")
     if if_none_match and _etag_matches(if_none_match, etag):
         return Response(
@@ -148,9 +293,11 @@ def read_dashboard_summary(
 
 
 @router.post("/generate-readings", response_model=GenerateReadingsResponse)
-def create_generated_readings(
+async def create_generated_readings(
     payload: GenerateReadingsRequest | None = None,
+    conn=Depends(get_conn),
 ) -> GenerateReadingsResponse:
     """Generate and insert synthetic sensor readings for selected assets/metrics."""
-    with get_connection() as conn:
-        return generate_sensor_readings(conn, payload or GenerateReadingsRequest())
+    result = await generate_sensor_readings(conn, payload or GenerateReadingsRequest())
+    _SUMMARY_CACHE.clear()
+    return result
@@ -44,6 +44,13 @@ class SensorReading(BaseModel):
     value: float
 
 
+class SensorReadingPage(BaseModel):
+    """One page of sensor readings plus an opaque forward cursor."""
+
+    items: list[SensorReading]
+    next_cursor: str | None
+
+
 class DashboardMetric(BaseModel):
     """Aggregated metric values for dashboard status cards."""
 
@@ -1,10 +1,21 @@
 """Database query and domain service functions for API handlers."""
 
+import base64
+import binascii
+import json
 import random
-from datetime import datetime, timezone
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException
 
+try:
+    from psycopg.rows import dict_row, kwargs_row
+except ImportError:
+    dict_row = None
+    kwargs_row = None
+
 from backend.api.schemas import (
     Asset,
     GenerateReadingsRequest,
@@ -13,21 +24,112 @@ from backend.api.schemas import (
     DashboardSummary,
     Facility,
     FacilityDetails,
-    SensorReading,
 )
 
 
+_SUM_METRICS: frozenset[str] = frozenset({"power_kw", "flow_l_min"})
+
+_SUMMARY_VIEW_REFRESH_TIMEOUT_MS = 60_000
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Reading ids are BIGSERIAL.
+_MAX_BIGINT = 2**63 - 1
+
+# Metrics and assets change rarely, so their lookup maps are cached per process
+# and joined onto readings in Python instead of in SQL.
+_DIMENSION_CACHE_TTL_SECONDS = 60.0
+_DIMENSION_MISS_RELOAD_FLOOR_SECONDS = 5.0
+# key -> (loaded_at on the monotonic clock, lookup map)
+_DIMENSION_CACHE: dict[str, tuple[float, dict]] = {}
+
+
 def _get_default_metric_aggregation(metric_name: str) -> str:
     """Return the default aggregation type for a metric card."""
-    if metric_name in {"power_kw", "flow_l_min"}:
-        return "sum"
-    return "avg"
+    return "sum" if metric_name in _SUM_METRICS else "avg"
+
+
+async def _get_cached_dimension(conn, key: str, sql: str, build, max_age: float) -> dict:
+    """Return a cached lookup map built from ``sql`` rows, reloading past ``max_age``."""
+    cached = _DIMENSION_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < max_age:
+        return cached[1]
 
+    async with conn.cursor() as cur:
+        await cur.execute(sql)
+        mapping = build(await cur.fetchall())
+
+    _DIMENSION_CACHE[key] = (time.monotonic(), mapping)
+    return mapping
+
+
+async def _get_metrics_map(
+    conn,
+    max_age: float = _DIMENSION_CACHE_TTL_SECONDS,
+) -> dict[int, tuple[str, str | None]]:
+    """Return cached metric_id -> (name, unit)."""
+    return await _get_cached_dimension(
+        conn,
+        "metrics",
+        "SELECT id, name, unit FROM metrics;",
+        lambda rows: {row[0]: (row[1], row[2]) for row in rows},
+        max_age,
+    )
+
+
+async def _get_asset_names(
+    conn,
+    max_age: float = _DIMENSION_CACHE_TTL_SECONDS,
+) -> dict[int, str]:
+    """Return cached asset_id -> name."""
+    return await _get_cached_dimension(
+        conn,
+        "assets",
+        "SELECT id, name FROM assets;",
+        lambda rows: {row[0]: row[1] for row in rows},
+        max_age,
+    )
 
-def _get_facility_row(conn, facility_id: int):
+
+async def _resolve_metric_id(conn, metric_name: str) -> int | None:
+    """Return the id for a metric name, or None when no such metric exists."""
+    # A miss reloads at most once per floor interval so unknown names stay cheap.
+    for max_age in (_DIMENSION_CACHE_TTL_SECONDS, _DIMENSION_MISS_RELOAD_FLOOR_SECONDS):
+        metrics = await _get_metrics_map(conn, max_age=max_age)
+        for metric_id, (name, _unit) in metrics.items():
+            if name == metric_name:
+                return metric_id
+    return None
+
+
+def _encode_reading_cursor(ts: datetime, reading_id: int) -> str:
+    """Encode a reading's keyset position as an opaque URL-safe cursor token."""
+    payload = json.dumps({"ts": ts.isoformat(), "id": reading_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_reading_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor token into its (after_ts, after_id) keyset position."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(payload, dict):
+            raise ValueError("cursor payload must be an object")
+        raw_ts = payload.get("ts")
+        after_id = payload.get("id")
+        if not isinstance(raw_ts, str) or type(after_id) is not int:
+            raise ValueError("cursor payload has invalid field types")
+        if not 1 <= after_id <= _MAX_BIGINT:
+            raise ValueError("cursor id out of range")
+        after_ts = datetime.fromisoformat(raw_ts)
+    except (binascii.Error, UnicodeError, ValueError, OverflowError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    return after_ts, after_id
+
+
+async def _get_facility_row(conn, facility_id: int):
     """Fetch one facility row or return None when it does not exist."""
-    with conn.cursor() as cur:
-        cur.execute(
+    async with conn.cursor() as cur:
+        await cur.execute(
             """
             SELECT id, name, location, created_at
             FROM facilities
@@ -35,54 +137,74 @@ def _get_facility_row(conn, facility_id: int):
             """,
             (facility_id,),
         )
-        return cur.fetchone()
+        return await cur.fetchone()
 
 
-def list_facilities(conn) -> list[Facility]:
+async def list_facilities(conn) -> list[Facility]:
     """Return all facilities from the data store."""
-    with conn.cursor() as cur:
-        cur.execute(
+    # Rows come straight from typed columns, so build models without re-validating.
+    async with conn.cursor(row_factory=kwargs_row(Facility.model_construct)) as cur:
+        await cur.execute(
             """
             SELECT id, name, location, created_at
             FROM facilities
             ORDER BY id;
             """
         )
-        rows = cur.fetchall()
-
-    return [Facility(id=row[0], name=row[1], location=row[2], created_at=row[3]) for row in rows]
+        return await cur.fetchall()
 
 
-def get_facility_details(conn, facility_id: int) -> FacilityDetails:
+async def get_facility_details(conn, facility_id: int) -> FacilityDetails:
     """Return one facility and all assets linked to it."""
-    facility_row = _get_facility_row(conn, facility_id)
-    if facility_row is None:
-        raise HTTPException(status_code=404, detail=f"Facility {facility_id} not found")
-
-    with conn.cursor() as cur:
-        cur.execute(
+    async with conn.cursor() as cur:
+        # Fetch the facility and its assets in one round-trip.
+        await cur.execute(
             """
-            SELECT id, facility_id, name, asset_type, created_at
-            FROM assets
-            WHERE facility_id = %s
-            ORDER BY id;
+            SELECT
+                f.id,
+                f.name,
+                f.location,
+                f.created_at,
+                COALESCE(
+                    jsonb_agg(
+                        jsonb_build_object(
+                            'id', a.id,
+                            'facility_id', a.facility_id,
+                            'name', a.name,
+                            'asset_type', a.asset_type,
+                            'created_at_us',
+                            (extract(epoch FROM a.created_at) * 1000000)::bigint
+                        )
+                        ORDER BY a.id
+                    ) FILTER (WHERE a.id IS NOT NULL),
+                    '[]'::jsonb
+                ) AS assets
+            FROM facilities f
+            LEFT JOIN assets a ON a.facility_id = f.id
+            WHERE f.id = %s
+            GROUP BY f.id;
             """,
             (facility_id,),
         )
-        asset_rows = cur.fetchall()
+        facility_row = await cur.fetchone()
 
+    if facility_row is None:
+        raise HTTPException(status_code=404, detail=f"Facility {facility_id} not found")
+
+    # JSON has no timestamp type, so created_at travels as integer epoch
+    # microseconds, which converts back exactly without string parsing.
     assets = [
-        Asset(
-            id=row[0],
-            facility_id=row[1],
-            name=row[2],
-            asset_type=row[3],
-            created_at=row[4],
+        Asset.model_construct(
+            id=asset["id"],
+            facility_id=asset["facility_id"],
+            name=asset["name"],
+            asset_type=asset["asset_type"],
+            created_at=_EPOCH + timedelta(microseconds=asset["created_at_us"]),
         )
-        for row in asset_rows
+        for asset in facility_row[4]
     ]
 
-    return FacilityDetails(
+    return FacilityDetails.model_construct(
         id=facility_row[0],
         name=facility_row[1],
         location=facility_row[2],
@@ -91,18 +213,44 @@ def get_facility_details(conn, facility_id: int) -> FacilityDetails:
     )
 
 
-def list_sensor_readings(
-    conn,
-    facility_id: int | None = None,
-    asset_id: int | None = None,
-    metric_name: str | None = None,
-    start: datetime | None = None,
-    end: datetime | None = None,
-    after_ts: datetime | None = None,
-    after_id: int | None = None,
-    limit: int = 500,
-) -> list[SensorReading]:
-    """Return filtered sensor readings, optionally using a forward cursor."""
+# Filters are NULL-guarded rather than assembled per call so each query text
+# stays constant and can be prepared once per connection.
+_SENSOR_READINGS_BASE_QUERY = """
+    SELECT
+        sr.id,
+        sr.facility_id,
+        sr.asset_id,
+        sr.metric_id,
+        sr.ts,
+        sr.value
+    FROM sensor_readings sr
+    WHERE (%(facility_id)s::bigint IS NULL OR sr.facility_id = %(facility_id)s)
+      AND (%(asset_id)s::bigint IS NULL OR sr.asset_id = %(asset_id)s)
+      AND (%(metric_id)s::bigint IS NULL OR sr.metric_id = %(metric_id)s)
+      AND (%(start)s::timestamptz IS NULL OR sr.ts >= %(start)s)
+      AND (%(end)s::timestamptz IS NULL OR sr.ts <= %(end)s)
+"""
+
+_SENSOR_READINGS_LATEST_QUERY = _SENSOR_READINGS_BASE_QUERY + """
+    ORDER BY sr.ts DESC, sr.id DESC
+    LIMIT %(limit)s;
+"""
+
+# Row-value form lets the planner bound a (ts, id) index range directly.
+_SENSOR_READINGS_AFTER_QUERY = _SENSOR_READINGS_BASE_QUERY + """
+      AND (sr.ts, sr.id) > (%(after_ts)s, %(after_id)s)
+    ORDER BY sr.ts ASC, sr.id ASC
+    LIMIT %(limit)s;
+"""
+
+
+def validate_sensor_reading_filters(
+    start: datetime | None,
+    end: datetime | None,
+    after_ts: datetime | None,
+    after_id: int | None,
+) -> None:
+    """Reject inconsistent time-range or cursor filters with HTTP 400."""
     if start and end and start > end:
         raise HTTPException(status_code=400, detail="start must be less than or equal to end")
     if (after_ts is None) != (after_id is None):
@@ -111,101 +259,142 @@ def list_sensor_readings(
             detail="after_ts and after_id must be provided together",
         )
 
-    # Build only supported filters; values are still parameterized.
-    filters: list[str] = []
-    params: list[object] = []
 
-    if facility_id is not None:
-        filters.append("sr.facility_id = %s")
-        params.append(facility_id)
+async def _build_sensor_readings_query(
+    conn,
+    facility_id: int | None,
+    asset_id: int | None,
+    metric_name: str | None,
+    start: datetime | None,
+    end: datetime | None,
+    after_ts: datetime | None,
+    after_id: int | None,
+    limit: int,
+) -> tuple[str, dict[str, object]] | None:
+    """Return (query, params) for a readings read, or None when nothing can match."""
+    metric_id = None
+    if metric_name:
+        metric_id = await _resolve_metric_id(conn, metric_name)
+        if metric_id is None:
+            return None
+
+    params = {
+        "facility_id": facility_id,
+        "asset_id": asset_id,
+        "metric_id": metric_id,
+        "start": start,
+        "end": end,
+        "after_ts": after_ts,
+        "after_id": after_id,
+        "limit": limit,
+    }
+    query = (
+        _SENSOR_READINGS_LATEST_QUERY if after_ts is None else _SENSOR_READINGS_AFTER_QUERY
+    )
+    return query, params
 
-    if asset_id is not None:
-        filters.append("sr.asset_id = %s")
-        params.append(asset_id)
 
-    if metric_name:
-        filters.append("m.name = %s")
-        params.append(metric_name)
-
-    if start is not None:
-        filters.append("sr.ts >= %s")
-        params.append(start)
-
-    if end is not None:
-        filters.append("sr.ts <= %s")
-        params.append(end)
-
-    if after_ts is not None and after_id is not None:
-        filters.append("(sr.ts > %s OR (sr.ts = %s AND sr.id > %s))")
-        params.extend([after_ts, after_ts, after_id])
-
-    where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
-    order_clause = "ORDER BY sr.ts ASC, sr.id ASC"
-    if after_ts is None:
-        order_clause = "ORDER BY sr.ts DESC, sr.id DESC"
-    query = f"""
-        SELECT
-            sr.id,
-            sr.facility_id,
-            sr.asset_id,
-            a.name AS asset_name,
-            sr.metric_id,
-            m.name AS metric_name,
-            m.unit,
-            sr.ts,
-            sr.value
-        FROM sensor_readings sr
-        JOIN assets a ON a.id = sr.asset_id
-        JOIN metrics m ON m.id = sr.metric_id
-        {where_clause}
-        {order_clause}
-        LIMIT %s;
-    """
-    params.append(limit)
-
-    with conn.cursor() as cur:
-        cur.execute(query, params)
-        rows = cur.fetchall()
-
-    return [
-        SensorReading(
-            id=row[0],
-            facility_id=row[1],
-            asset_id=row[2],
-            asset_name=row[3],
-            metric_id=row[4],
-            metric_name=row[5],
-            unit=row[6],
-            ts=row[7],
-            value=row[8],
-        )
-        for row in rows
-    ]
+async def list_sensor_readings(
+    conn,
+    facility_id: int | None = None,
+    asset_id: int | None = None,
+    metric_name: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    after_ts: datetime | None = None,
+    after_id: int | None = None,
+    limit: int = 500,
+) -> dict[str, object]:
+    """Return a page of filtered sensor readings, optionally using a forward cursor.
 
+    Rows are returned as plain dicts shaped like ``SensorReadingPage`` so the
+    route can serialize them directly without building a model per reading.
+    Callers are expected to have run ``validate_sensor_reading_filters`` first.
+    """
+    prepared = await _build_sensor_readings_query(
+        conn, facility_id, asset_id, metric_name, start, end, after_ts, after_id, limit
+    )
+    if prepared is None:
+        return {"items": [], "next_cursor": None}
+    query, params = prepared
+
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(query, params, prepare=True)
+        items = await cur.fetchall()
+
+    metrics = await _get_metrics_map(conn)
+    asset_names = await _get_asset_names(conn)
+    if any(
+        item["metric_id"] not in metrics or item["asset_id"] not in asset_names
+        for item in items
+    ):
+        metrics = await _get_metrics_map(conn, max_age=0.0)
+        asset_names = await _get_asset_names(conn, max_age=0.0)
+
+    for item in items:
+        item["asset_name"] = asset_names[item["asset_id"]]
+        item["metric_name"], item["unit"] = metrics[item["metric_id"]]
+
+    # The cursor always points at the newest row returned: cursor reads are
+    # ascending, while initial window reads are newest-first.
+    next_cursor = None
+    if items:
+        newest = items[-1] if after_ts is not None else items[0]
+        next_cursor = _encode_reading_cursor(newest["ts"], newest["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def stream_sensor_readings(
+    conn,
+    facility_id: int | None = None,
+    asset_id: int | None = None,
+    metric_name: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    after_ts: datetime | None = None,
+    after_id: int | None = None,
+    limit: int = 500,
+) -> AsyncIterator[dict[str, object]]:
+    """Yield filtered sensor readings one at a time from a server-side cursor.
 
-def get_dashboard_summary(conn, facility_id: int) -> DashboardSummary:
+    Callers are expected to have run ``validate_sensor_reading_filters`` first,
+    since errors raised mid-stream can no longer change the response status.
+    """
+    prepared = await _build_sensor_readings_query(
+        conn, facility_id, asset_id, metric_name, start, end, after_ts, after_id, limit
+    )
+    if prepared is None:
+        return
+    query, params = prepared
+
+    metrics = await _get_metrics_map(conn)
+    asset_names = await _get_asset_names(conn)
+
+    async with conn.cursor(name=f"sr_{id(params)}", row_factory=dict_row) as cur:
+        cur.itersize = 1000
+        await cur.execute(query, params)
+        async for row in cur:
+            if row["metric_id"] not in metrics or row["asset_id"] not in asset_names:
+                metrics = await _get_metrics_map(conn, max_age=0.0)
+                asset_names = await _get_asset_names(conn, max_age=0.0)
+            row["asset_name"] = asset_names[row["asset_id"]]
+            row["metric_name"], row["unit"] = metrics[row["metric_id"]]
+            yield row
+
+
+async def get_dashboard_summary(conn, facility_id: int) -> DashboardSummary:
     """Return current per-metric status based on latest reading per asset/metric."""
-    facility_row = _get_facility_row(conn, facility_id)
+    facility_row = await _get_facility_row(conn, facility_id)
     if facility_row is None:
         raise HTTPException(status_code=404, detail=f"Facility {facility_id} not found")
 
-    with conn.cursor() as cur:
-        cur.execute(
+    # Binary results skip text parsing of the float/timestamp aggregates, and
+    # preparing the constant statement skips parse/plan on repeat calls.
+    async with conn.cursor(binary=True) as cur:
+        await cur.execute(
             """
-            WITH latest_per_asset_metric AS (
-                -- Keep one most-recent reading per (asset_id, metric_id).
-                SELECT DISTINCT ON (sr.asset_id, sr.metric_id)
-                    sr.asset_id,
-                    sr.metric_id,
-                    sr.ts,
-                    sr.value
-                FROM sensor_readings sr
-                WHERE sr.facility_id = %s
-                ORDER BY sr.asset_id, sr.metric_id, sr.ts DESC, sr.id DESC
-            )
             SELECT
-                m.name AS metric_name,
-                m.unit,
+                l.metric_id,
                 MAX(l.ts) AS latest_ts,
                 COUNT(*) AS contributing_assets,
                 SUM(l.value) AS sum_value,
@@ -214,45 +403,52 @@ def get_dashboard_summary(conn, facility_id: int) -> DashboardSummary:
                 MAX(l.value) AS max_value,
                 percentile_cont(0.25) WITHIN GROUP (ORDER BY l.value) AS p25,
                 percentile_cont(0.75) WITHIN GROUP (ORDER BY l.value) AS p75
+            -- Materialized view holds one most-recent reading per (asset_id, metric_id).
             FROM latest_per_asset_metric l
-            JOIN metrics m ON m.id = l.metric_id
-            GROUP BY m.name, m.unit
-            ORDER BY m.name;
+            WHERE l.facility_id = %s
+            GROUP BY l.metric_id;
             """,
             (facility_id,),
+            prepare=True,
         )
-        rows = cur.fetchall()
+        rows = await cur.fetchall()
+
+    metrics_by_id = await _get_metrics_map(conn)
+    if any(row[0] not in metrics_by_id for row in rows):
+        metrics_by_id = await _get_metrics_map(conn, max_age=0.0)
 
     metrics: list[DashboardMetric] = []
     for row in rows:
-        default_aggregation = _get_default_metric_aggregation(row[0])
+        metric_name, unit = metrics_by_id[row[0]]
+        default_aggregation = _get_default_metric_aggregation(metric_name)
         aggregation_values = {
-            "sum": row[4],
-            "avg": row[5],
-            "min": row[6],
-            "max": row[7],
-            "p25": row[8],
-            "p75": row[9]
+            "sum": row[3],
+            "avg": row[4],
+            "min": row[5],
+            "max": row[6],
+            "p25": row[7],
+            "p75": row[8]
         }
         metrics.append(
-            DashboardMetric(
-                metric_name=row[0],
-                unit=row[1],
+            DashboardMetric.model_construct(
+                metric_name=metric_name,
+                unit=unit,
                 aggregation=default_aggregation,
                 aggregation_values=aggregation_values,
-                latest_ts=row[2],
+                latest_ts=row[1],
                 aggregated_value=aggregation_values[default_aggregation],
-                contributing_assets=row[3],
+                contributing_assets=row[2],
             )
         )
-    return DashboardSummary(
+    metrics.sort(key=lambda metric: metric.metric_name)
+    return DashboardSummary.model_construct(
         facility_id=facility_id,
         generated_at=datetime.now(timezone.utc),
         metrics=metrics,
     )
 
 
-def generate_sensor_readings(
+async def generate_sensor_readings(
     conn,
     payload: GenerateReadingsRequest,
 ) -> GenerateReadingsResponse:
@@ -262,9 +458,9 @@ def generate_sensor_readings(
 
     metric_names = payload.metric_names or ["power_kw", "temperature_c"]
 
-    with conn.cursor() as cur:
+    async with conn.cursor() as cur:
         if payload.asset_ids:
-            cur.execute(
+            await cur.execute(
                 """
                 SELECT id, facility_id
                 FROM assets
@@ -273,7 +469,7 @@ def generate_sensor_readings(
                 """,
                 (payload.asset_ids,),
             )
-            asset_rows = cur.fetchall()
+            asset_rows = await cur.fetchall()
             found_asset_ids = {row[0] for row in asset_rows}
             missing_asset_ids = sorted(set(payload.asset_ids) - found_asset_ids)
             if missing_asset_ids:
@@ -282,19 +478,19 @@ def generate_sensor_readings(
                     detail=f"Assets not found: {missing_asset_ids}",
                 )
         else:
-            cur.execute(
+            await cur.execute(
                 """
                 SELECT id, facility_id
                 FROM assets
                 ORDER BY id;
                 """
             )
-            asset_rows = cur.fetchall()
+            asset_rows = await cur.fetchall()
 
         if not asset_rows:
             raise HTTPException(status_code=400, detail="No assets available to generate readings")
 
-        cur.execute(
+        await cur.execute(
             """
             SELECT id, name
             FROM metrics
@@ -303,7 +499,7 @@ def generate_sensor_readings(
             """,
             (metric_names,),
         )
-        metric_rows = cur.fetchall()
+        metric_rows = await cur.fetchall()
 
         found_metric_names = {row[1] for row in metric_rows}
         missing_metric_names = [name for name in metric_names if name not in found_metric_names]
@@ -330,15 +526,21 @@ def generate_sensor_readings(
                     )
                 )
 
-        cur.executemany(
+        await cur.executemany(
             """
             INSERT INTO sensor_readings (facility_id, asset_id, metric_id, ts, value)
             VALUES (%s, %s, %s, %s, %s);
             """,
             insert_rows,
         )
+        # The refresh rescans all readings, so it gets its own (transaction-local)
+        # budget instead of the pool-wide 5 s statement_timeout.
+        await cur.execute(
+            f"SET LOCAL statement_timeout = {_SUMMARY_VIEW_REFRESH_TIMEOUT_MS};"
+        )
+        await cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY latest_per_asset_metric;")
 
-    conn.commit()
+    await conn.commit()
     return GenerateReadingsResponse(
         status="inserted",
         inserted=len(insert_rows),
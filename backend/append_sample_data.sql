@@ -106,4 +106,6 @@ inserted AS (
 SELECT COUNT(*)::INT AS inserted_rows
 FROM inserted;
 
+REFRESH MATERIALIZED VIEW CONCURRENTLY latest_per_asset_metric;
+
 COMMIT;
@@ -48,4 +48,24 @@ CREATE INDEX IF NOT EXISTS idx_readings_metric_ts
 CREATE INDEX IF NOT EXISTS idx_readings_fac_asset_metric_ts
   ON sensor_readings (facility_id, asset_id, metric_id, ts DESC);
 
+-- Covers keyset reads: (sr.ts, sr.id) > (?, ?) within one facility.
+CREATE INDEX IF NOT EXISTS idx_sr_facility_ts_id
+  ON sensor_readings (facility_id, ts, id) INCLUDE (asset_id, metric_id, value);
+
+-- Latest reading per (asset_id, metric_id) backing the dashboard summary.
+-- Refreshed by writers after inserting readings.
+CREATE MATERIALIZED VIEW IF NOT EXISTS latest_per_asset_metric AS
+SELECT DISTINCT ON (asset_id, metric_id)
+  facility_id,
+  asset_id,
+  metric_id,
+  ts,
+  value
+FROM sensor_readings
+ORDER BY asset_id, metric_id, ts DESC, id DESC;
+
+-- Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_latest_per_asset_metric_fac_asset_metric
+  ON latest_per_asset_metric (facility_id, asset_id, metric_id);
+
 COMMIT;
\ No newline at end of file
@@ -1,13 +1,51 @@
 """FastAPI application bootstrap and middleware configuration."""
 
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
 
-from backend.api import router as api_router
+from backend.api import accepts_ndjson, router as api_router
+from backend.api.db import create_pool
 
-app = FastAPI(title="IndustrialDashboard API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared connection pool on startup and close it on shutdown."""
+    pool = app.state.pool
+    if pool is not None:
+        await pool.open()
+    try:
+        yield
+    finally:
+        if pool is not None:
+            await pool.close()
+
+
+class NDJSONPassthroughGZipMiddleware(GZipMiddleware):
+    """Gzip responses, except NDJSON streams negotiated via the Accept header.
+
+    Streamed chunks would sit in the gzip compressor's buffer until it fills,
+    holding back rows that clients expect to consume line by line.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and accepts_ndjson(Headers(scope=scope).get("accept", "")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app = FastAPI(
+    title="IndustrialDashboard API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.state.pool = create_pool()
 
 raw_cors_origins = os.getenv("CORS_ALLOW_ORIGINS", "")
 cors_allow_origins = [
@@ -26,4 +64,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Large /sensor-readings payloads compress well (repeated asset/metric names);
+# small bodies such as empty 304s stay below the threshold and pass through.
+app.add_middleware(NDJSONPassthroughGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.include_router(api_router)
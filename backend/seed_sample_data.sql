@@ -96,4 +96,6 @@ JOIN asset_metric am
  AND am.metric_id = s.metric_id
 ORDER BY s.asset_id, s.metric_id, s.ts;
 
+REFRESH MATERIALIZED VIEW latest_per_asset_metric;
+
 COMMIT;
@@ -4,7 +4,7 @@ import type {
   FacilityDetails,
   GenerateReadingsRequest,
   GenerateReadingsResponse,
-  SensorReading,
+  SensorReadingPage,
 } from "./types";
 
 const rawApiBaseUrl =
@@ -117,18 +117,16 @@ export function fetchSensorReadings(args: {
   metricName?: string;
   start?: string;
   end?: string;
-  afterTs?: string;
-  afterId?: number;
+  cursor?: string;
   limit?: number;
 }) {
-  return apiGet<SensorReading[]>("/sensor-readings", {
+  return apiGet<SensorReadingPage>("/sensor-readings", {
     facility_id: args.facilityId,
     asset_id: args.assetId,
     metric_name: args.metricName,
     start: args.start,
     end: args.end,
-    after_ts: args.afterTs,
-    after_id: args.afterId,
+    cursor: args.cursor,
     limit: args.limit ?? 500,
   });
 }
@@ -45,10 +45,6 @@ const ALL_ASSETS_VALUE = 0;
 const DARK_MODE_STORAGE_KEY = "industrialdashboard_dark_mode";
 const AGGREGATION_KEYS = ["sum", "avg", "min", "max", "p25", "p75"] as const;
 type AggregationKey = (typeof AGGREGATION_KEYS)[number];
-type TrendCursor = {
-  afterId: number;
-  afterTs: string;
-};
 const { useBreakpoint } = Grid;
 const TIME_WINDOW_OPTIONS = [
   { label: "Last 1 hour", value: 1 },
@@ -217,37 +213,6 @@ function buildTimeSeries(
   );
 }
 
-function compareCursorPosition(
-  leftTs: string,
-  leftId: number,
-  rightTs: string,
-  rightId: number,
-) {
-  const leftMs = Date.parse(leftTs);
-  const rightMs = Date.parse(rightTs);
-  const normalizedLeftMs = Number.isNaN(leftMs) ? 0 : leftMs;
-  const normalizedRightMs = Number.isNaN(rightMs) ? 0 : rightMs;
-  if (normalizedLeftMs !== normalizedRightMs) {
-    return normalizedLeftMs - normalizedRightMs;
-  }
-  return leftId - rightId;
-}
-
-function getLatestTrendCursor(readings: SensorReading[]): TrendCursor | null {
-  let latest: TrendCursor | null = null;
-
-  for (const reading of readings) {
-    if (
-      latest === null ||
-      compareCursorPosition(reading.ts, reading.id, latest.afterTs, latest.afterId) > 0
-    ) {
-      latest = { afterId: reading.id, afterTs: reading.ts };
-    }
-  }
-
-  return latest;
-}
-
 function mergeTrendReadings(
   existingReadings: SensorReading[],
   incomingReadings: SensorReading[],
@@ -301,7 +266,7 @@ export default function PlantStatus() {
   );
   const [customTimeRange, setCustomTimeRange] = useState<[Date, Date] | null>(null);
   const [trendReadings, setTrendReadings] = useState<SensorReading[]>([]);
-  const trendCursorRef = useRef<TrendCursor | null>(null);
+  const trendCursorRef = useRef<string | null>(null);
   const [refreshToken, setRefreshToken] = useState(0);
   const [autoRefreshEnabled, setAutoRefreshEnabled] = useState(true);
   const [isDarkMode, setIsDarkMode] = useState(getInitialDarkMode);
@@ -490,14 +455,13 @@ export default function PlantStatus() {
       const useCursor = !customTimeRange && refreshToken > 0 && cursor !== null;
 
       try {
-        const readings = await fetchSensorReadings({
+        const page = await fetchSensorReadings({
           facilityId,
           assetId,
           metricName,
           start: start.toISOString(),
           end: end.toISOString(),
-          afterTs: useCursor ? cursor.afterTs : undefined,
-          afterId: useCursor ? cursor.afterId : undefined,
+          cursor: useCursor ? cursor : undefined,
           limit: TREND_PAGE_LIMIT,
         });
 
@@ -505,31 +469,18 @@ export default function PlantStatus() {
 
         if (useCursor) {
           setTrendReadings((previous) =>
-            mergeTrendReadings(previous, readings, start, end),
+            mergeTrendReadings(previous, page.items, start, end),
           );
         } else {
-          setTrendReadings(mergeTrendReadings([], readings, start, end));
+          setTrendReadings(mergeTrendReadings([], page.items, start, end));
         }
 
         if (customTimeRange) {
           trendCursorRef.current = null;
-        } else {
-          const latestCursor = getLatestTrendCursor(readings);
-          if (latestCursor === null) {
-            if (!useCursor) {
-              trendCursorRef.current = null;
-            }
-          } else if (
-            trendCursorRef.current === null ||
-            compareCursorPosition(
-              latestCursor.afterTs,
-              latestCursor.afterId,
-              trendCursorRef.current.afterTs,
-              trendCursorRef.current.afterId,
-            ) > 0
-          ) {
-            trendCursorRef.current = latestCursor;
-          }
+        } else if (page.next_cursor !== null) {
+          trendCursorRef.current = page.next_cursor;
+        } else if (!useCursor) {
+          trendCursorRef.current = null;
         }
 
         setErrorMessage(null);
@@ -29,6 +29,11 @@ export type SensorReading = {
   value: number;
 };
 
+export type SensorReadingPage = {
+  items: SensorReading[];
+  next_cursor: string | null;
+};
+
 export type DashboardMetric = {
   metric_name: string;
   unit: string | null;